@@ -8,6 +8,9 @@ import zigpy
 
 REQUIRES = ["aiohttp", "aiosqlite>=0.16.0", "crccheck", "pycryptodome", "voluptuous"]
 
+# AES is done by OpenSSL through cryptography when it is installed
+EXTRAS_REQUIRE = {"cryptography": ["cryptography"]}
+
 setup(
     name="zigpy",
     version=zigpy.__version__,
@@ -20,4 +23,5 @@ setup(
     license="GPL-3.0",
     packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
 )
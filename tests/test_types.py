@@ -39,6 +39,112 @@ def test_int_too_short():
         t.uint16_t.deserialize(b"\x00")
 
 
+@pytest.mark.parametrize(
+    "int_type, data, value",
+    [
+        (t.uint8_t, b"\xFF", 0xFF),
+        (t.int8s, b"\xFF", -1),
+        (t.uint16_t, b"\x34\x12", 0x1234),
+        (t.int16s, b"\xFE\xFF", -2),
+        (t.uint24_t, b"\x56\x34\x12", 0x123456),
+        (t.int24s, b"\xFF\xFF\xFF", -1),
+        (t.uint32_t, b"\x78\x56\x34\x12", 0x12345678),
+        (t.uint48_t, b"\x01\x00\x00\x00\x00\x80", 0x800000000001),
+        (t.int64s, b"\xFF" * 8, -1),
+        (t.uint64_t, b"\xFF" * 8, 0xFFFFFFFFFFFFFFFF),
+    ],
+)
+def test_int_deserialize(int_type, data, value):
+    result, rest = int_type.deserialize(data + b"extra")
+
+    assert rest == b"extra"
+    assert result == value
+    assert type(result) is int_type
+    assert result.serialize() == data
+
+
+def test_enum_deserialize_type():
+    class TestEnum(t.enum8):
+        Member = 0x01
+
+    assert TestEnum.deserialize(b"\x01") == (TestEnum.Member, b"")
+    value, _ = TestEnum.deserialize(b"\x02")
+    assert type(value) is TestEnum
+    assert value == 0x02
+
+
+class Clamped(t.uint8_t):
+    def __new__(cls, value):
+        return super().__new__(cls, min(value, 100))
+
+
+class ClampedChild(Clamped):
+    pass
+
+
+class Tagged(t.uint8_t):
+    def __init__(self, value):
+        self.tag = "tagged"
+
+
+def test_int_deserialize_custom_constructor():
+    assert t.uint8_t._plain_int
+    assert not Clamped._plain_int
+    assert not ClampedChild._plain_int
+    assert not Tagged._plain_int
+
+    assert Clamped.deserialize(b"\xFF") == (100, b"")
+    assert type(Clamped.deserialize(b"\xFF")[0]) is Clamped
+
+    assert ClampedChild.deserialize(b"\xFF") == (100, b"")
+    assert type(ClampedChild.deserialize(b"\xFF")[0]) is ClampedChild
+
+    value, _ = Tagged.deserialize(b"\x01")
+    assert value == 1
+    assert value.tag == "tagged"
+
+
+def test_deserialize_schema():
+    schema = (t.uint8_t, t.int16s, t.uint32_t)
+    data = b"\x01\xFE\xFF\x78\x56\x34\x12"
+
+    result, rest = t.deserialize(data + b"extra", schema)
+    assert result == [1, -2, 0x12345678]
+    assert [type(v) for v in result] == list(schema)
+    assert rest == b"extra"
+
+    with pytest.raises(ValueError):
+        t.deserialize(data[:-1], schema)
+
+    assert t.deserialize(b"abc", ()) == ([], b"abc")
+
+
+def test_deserialize_schema_mixed():
+    schema = (t.uint8_t, t.Bool, t.uint24_t, t.Optional(t.uint16_t))
+
+    result, rest = t.deserialize(b"\x01\x01\x03\x02\x01", schema)
+    assert result == [1, t.Bool.true, 0x010203, None]
+    assert type(result[1]) is t.Bool
+    assert rest == b""
+
+
+def test_deserialize_schema_custom_constructor():
+    schema = (t.uint8_t, Clamped, Tagged)
+
+    result, rest = t.deserialize(b"\x01\xFF\x02extra", schema)
+    assert result == [1, 100, 2]
+    assert [type(v) for v in result] == list(schema)
+    assert result[2].tag == "tagged"
+    assert rest == b"extra"
+
+
+def test_optional_cached():
+    assert t.Optional(t.uint16_t) is t.Optional(t.uint16_t)
+    assert t.Optional(t.uint16_t) is not t.Optional(t.uint8_t)
+    assert issubclass(t.Optional(t.uint16_t), t.uint16_t)
+    assert t.Optional(t.uint16_t).deserialize(b"\x01") == (None, b"")
+
+
 def compare_with_nan(v1, v2):
     if not math.isnan(v1) ^ math.isnan(v2):
         return True
@@ -277,6 +383,25 @@ def test_fixedlist():
     assert t.FixedList[t.uint8_t, 2]([1, 2]).serialize() == b"\x01\x02"
 
 
+def test_fixedbytes():
+    with pytest.raises(ValueError):
+        t.FixedBytes[2](b"").serialize()
+
+    with pytest.raises(ValueError):
+        t.FixedBytes[2](b"\x01\x02\x03").serialize()
+
+    with pytest.raises(ValueError):
+        t.FixedBytes[2].deserialize(b"\x01")
+
+    assert t.FixedBytes[2]([1, 2]).serialize() == b"\x01\x02"
+    assert t.FixedBytes[2] is t.FixedBytes[2]
+
+    key, rest = t.FixedBytes[16].deserialize(bytes(range(17)))
+    assert key == bytes(range(16))
+    assert isinstance(key, t.FixedBytes[16])
+    assert rest == b"\x10"
+
+
 def test_lvlist_types():
     # Brackets create singleton types
     anon_lst1 = t.LVList[t.uint16_t]
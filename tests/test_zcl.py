@@ -186,7 +186,8 @@ def test_attribute_report(cluster):
     def mock_type(*args, **kwargs):
         raise ValueError
 
-    with patch.dict(cluster.attributes, {0xAAAA: ("Name", mock_type)}):
+    attributes = {**cluster.attributes, 0xAAAA: ("Name", mock_type)}
+    with patch.object(cluster, "attributes", attributes):
         attr.attrid = 0xAAAA
         cluster.handle_message(hdr, [[attr]])
         assert cluster._attr_cache[attr.attrid] == "manufacturer"
@@ -319,7 +320,8 @@ async def test_read_attributes_value_normalization_error(cluster):
         raise ValueError
 
     cluster.request = mockrequest
-    with patch.dict(cluster.attributes, {5: ("Name", mock_type)}):
+    attributes = {**cluster.attributes, 5: ("Name", mock_type)}
+    with patch.object(cluster, "attributes", attributes):
         success, failure = await cluster.read_attributes(["model"], allow_cache=True)
     assert failure == {}
     assert success["model"] == "Model"
@@ -397,6 +399,7 @@ async def test_write_attributes_wrong_type(cluster):
         (0, "device_enabled", True, b"\x12\x00\x10\x01"),
         (0, "alarm_mask", 0x55, b"\x13\x00\x18\x55"),
         (0x0202, "fan_mode", 0xDE, b"\x00\x00\x30\xde"),
+        (0x0015, "network_key", bytes(range(16)), b"\x12\x00\xf1" + bytes(range(16))),
     ),
 )
 async def test_write_attribute_types(
@@ -647,6 +650,18 @@ def test_invalid_arguments_cluster_client_command(client_cluster):
     assert client_cluster._endpoint.reply.call_count == 1
 
 
+def test_log_disabled_level(cluster):
+    with patch.object(zcl.LOGGER, "isEnabledFor", return_value=False):
+        with patch.object(zcl.LOGGER, "log") as log_mock:
+            cluster.debug("Debug message %s", sentinel.arg)
+    assert log_mock.call_count == 0
+
+    with patch.object(zcl.LOGGER, "isEnabledFor", return_value=True):
+        with patch.object(zcl.LOGGER, "log") as log_mock:
+            cluster.debug("Debug message %s", sentinel.arg)
+    assert log_mock.call_count == 1
+
+
 def test_name(cluster):
     assert cluster.name == "Basic"
 
@@ -655,6 +670,57 @@ def test_commands(cluster):
     assert cluster.commands == ["reset_fact_default"]
 
 
+def test_name_indexes_per_class():
+    class TestCluster(zcl.Cluster):
+        cluster_id = 0xFF01
+        ep_attribute = "test_cluster"
+        attributes = {0x0000: ("attr_0", t.uint8_t)}
+        server_commands = {0x00: ("server_cmd_0", (), False)}
+        client_commands = {}
+
+    assert "_attridx_cache" not in TestCluster.__dict__
+    assert TestCluster.attridx == {"attr_0": 0x0000}
+    assert TestCluster.attridx is TestCluster.__dict__["_attridx_cache"]
+
+    class TestSubCluster(TestCluster):
+        cluster_id = 0xFF02
+        ep_attribute = "test_sub_cluster"
+        attributes = {**TestCluster.attributes, 0x0001: ("attr_1", t.uint8_t)}
+
+    assert TestSubCluster.attridx == {"attr_0": 0x0000, "attr_1": 0x0001}
+    assert TestSubCluster._server_commands_idx == {"server_cmd_0": 0x00}
+    assert TestCluster.attridx == {"attr_0": 0x0000}
+
+    del zcl.Cluster._registry[0xFF01]
+    del zcl.Cluster._registry[0xFF02]
+
+
+def test_definitions_frozen():
+    on_off = zcl.Cluster._registry[0x0006]
+    level = zcl.Cluster._registry[0x0008]
+
+    with pytest.raises(TypeError):
+        on_off.attributes[0xFFFF] = ("test", t.uint8_t)
+
+    with pytest.raises(TypeError):
+        on_off.server_commands[0xFF] = ("test", (), False)
+
+    # equal schemas are shared between clusters
+    assert level.server_commands[0x01][1] is level.server_commands[0x05][1]
+
+    # subclasses can still extend a copy
+    attributes = on_off.attributes.copy()
+    attributes[0xFFFF] = ("test", t.uint8_t)
+    assert 0xFFFF not in on_off.attributes
+
+
+def test_attributes_by_name(cluster):
+    assert cluster.attributes_by_name["model"] == (0x0005, t.CharacterString)
+    assert cluster.attributes_by_name is type(cluster).attributes_by_name
+    with pytest.raises(TypeError):
+        cluster.attributes_by_name["model"] = (0x0006, t.CharacterString)
+
+
 def test_general_command(cluster):
     cluster.request = MagicMock()
     cluster.reply = MagicMock()
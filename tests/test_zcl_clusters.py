@@ -1,5 +1,6 @@
 import asyncio
 import re
+import time
 
 import pytest
 
@@ -9,7 +10,7 @@ import zigpy.types as types
 import zigpy.zcl as zcl
 import zigpy.zcl.clusters.security as sec
 
-from .async_mock import AsyncMock, MagicMock, sentinel
+from .async_mock import AsyncMock, MagicMock, patch, sentinel
 
 IMAGE_SIZE = 0x2345
 IMAGE_OFFSET = 0x2000
@@ -98,6 +99,37 @@ async def test_time_cluster():
     assert ep.reply.call_args[0][2][3] == 7
 
 
+@pytest.mark.parametrize(
+    "cluster_id",
+    [0x000C, 0x000D, 0x000E, 0x000F, 0x0010, 0x0011, 0x0012, 0x0013, 0x0014],
+)
+def test_bacnet_common_attributes(cluster_id):
+    cluster = zcl.Cluster._registry[cluster_id]
+
+    for name in ("description", "out_of_service", "reliability", "status_flags"):
+        assert name in cluster.attributes_by_name
+
+    assert cluster.attributes_by_name["present_value"][0] == 0x0055
+    assert cluster.attributes[0x0100] is zcl.clusters.general._BACNET_COMMON[0x0100]
+
+
+async def test_time_cluster_values():
+    ep = MagicMock()
+    ep.reply = AsyncMock()
+    t = zcl.Cluster._registry[0x000A](ep)
+
+    hdr_general = zcl.foundation.ZCLHeader.general
+    now = zcl.clusters.general.ZCL_EPOCH + 0x12345678
+    with patch("time.time", return_value=now), patch("time.timezone", -3600):
+        t.handle_message(hdr_general(123, 0), [[0, 2]])
+
+    hdr, (records,) = t.deserialize(ep.reply.call_args[0][2])
+    assert records[0].attrid == 0
+    assert records[0].value.value == 0x12345678
+    assert records[1].attrid == 2
+    assert records[1].value.value == 3600
+
+
 async def test_time_cluster_unsupported():
     ep = MagicMock()
     ep.reply.side_effect = asyncio.coroutine(MagicMock())
@@ -111,6 +143,206 @@ async def test_time_cluster_unsupported():
     assert ep.reply.call_args[0][2][-6:] == b"\xc7\x00\x86\x80\x00\x86"
 
 
+@pytest.fixture
+def gp_cluster():
+    ep = MagicMock()
+    return zcl.Cluster._registry[0x0021](ep)
+
+
+GP_IEEE = types.EUI64.convert("04:03:02:01:04:03:02:01")
+GP_KEY = bytes(range(16))
+GP_HEADER = b"\x0c\x8c"
+GP_COUNTER = b"\x34\x12\x00\x00"
+
+
+def _gp_device(gp_cluster, key=GP_KEY):
+    dev = MagicMock()
+    dev.endpoints[242].in_clusters[0x0021]._attr_cache = {}
+    if key is not None:
+        dev.endpoints[242].in_clusters[0x0021]._attr_cache[0x9998] = key
+    gp_cluster.endpoint.device.application.devices = {GP_IEEE: dev}
+    return dev
+
+
+@pytest.mark.parametrize(
+    "payload, mic",
+    (
+        (b"", b"\x7d\xca\xc0\x4a"),
+        (b"\x20", b"\xf8\x42\x95\x0d"),
+        (b"\x30\x05", b"\x81\x4a\x9b\xba"),
+        (b"\x32\x05\x01", b"\x1c\x6e\xd2\x22"),
+        (bytes.fromhex("4b1027102710"), b"\x0f\xc1\xea\x01"),
+    ),
+)
+def test_gp_calcul_mic(gp_cluster, payload, mic):
+    _gp_device(gp_cluster)
+    assert gp_cluster.calcul_mic(GP_IEEE, GP_HEADER, GP_COUNTER, payload) == mic
+
+
+def test_gp_calcul_mic_no_key(gp_cluster):
+    _gp_device(gp_cluster, key=None)
+    assert gp_cluster.calcul_mic(GP_IEEE, GP_HEADER, GP_COUNTER, b"\x20") is None
+
+    gp_cluster.endpoint.device.application.devices = {}
+    assert gp_cluster.calcul_mic(GP_IEEE, GP_HEADER, GP_COUNTER, b"\x20") is None
+
+
+def test_gp_handle_message(gp_cluster):
+    """Header, counter, payload and mic are passed on as raw bytes."""
+    frame = b"\x0c\x8c\x01\x02\x03\x04\x34\x12\x00\x00\x20\xf8\x42\x95\x0d"
+
+    with patch.object(gp_cluster, "handle_notification") as handle_notification:
+        gp_cluster.handle_message([frame])
+
+    handle_notification.assert_called_once_with(
+        GP_IEEE, GP_HEADER, GP_COUNTER, 0x20, b"", b"\xf8\x42\x95\x0d"
+    )
+
+
+def test_gp_handle_notification(gp_cluster):
+    dev = _gp_device(gp_cluster)
+    gp_dev_cluster = dev.endpoints[242].in_clusters[0x0021]
+    on_off = dev.endpoints[1].out_clusters[0x0006]
+
+    # command 0x20 (Off) without payload
+    gp_cluster.handle_notification(
+        GP_IEEE, GP_HEADER, GP_COUNTER, 0x20, b"", b"\xf8\x42\x95\x0d"
+    )
+    gp_dev_cluster._update_attribute.assert_called_once_with(0x9999, 0x1234)
+    assert on_off.handle_message.call_count == 1
+    hdr, value = on_off.handle_message.call_args[0]
+    assert hdr.command_id == 0x0000
+    assert value == ()
+
+
+def test_gp_handle_notification_wrong_mic(gp_cluster):
+    dev = _gp_device(gp_cluster)
+    gp_dev_cluster = dev.endpoints[242].in_clusters[0x0021]
+
+    gp_cluster.handle_notification(
+        GP_IEEE, GP_HEADER, GP_COUNTER, 0x20, b"", b"\x00\x00\x00\x00"
+    )
+    assert gp_dev_cluster._update_attribute.call_count == 0
+    assert dev.endpoints[1].out_clusters[0x0006].handle_message.call_count == 0
+
+
+def test_gp_handle_notification_replayed(gp_cluster):
+    dev = _gp_device(gp_cluster)
+    gp_dev_cluster = dev.endpoints[242].in_clusters[0x0021]
+    gp_dev_cluster._attr_cache[0x9999] = 0x1234
+
+    gp_cluster.handle_notification(
+        GP_IEEE, GP_HEADER, GP_COUNTER, 0x20, b"", b"\xf8\x42\x95\x0d"
+    )
+    assert gp_dev_cluster._update_attribute.call_count == 0
+    assert dev.endpoints[1].out_clusters[0x0006].handle_message.call_count == 0
+
+
+def test_gp_handle_notification_truncated(gp_cluster):
+    dev = _gp_device(gp_cluster, key=None)
+    gp_dev_cluster = dev.endpoints[242].in_clusters[0x0021]
+
+    # command 0x30 (Move Up) is missing its rate argument
+    gp_cluster.handle_notification(
+        GP_IEEE, GP_HEADER, GP_COUNTER, 0x30, b"", b"\x00\x00\x00\x00"
+    )
+    assert gp_dev_cluster._update_attribute.call_count == 0
+    assert dev.endpoints[1].out_clusters[0x0008].handle_message.call_count == 0
+
+
+def test_gp_set_key(gp_cluster):
+    with patch("zigpy.util.clear_key_cache") as clear_key_cache:
+        gp_cluster.set_key(0x000102030405060708090A0B0C0D0E0F)
+        assert gp_cluster._attr_cache[0x9998] == GP_KEY
+        assert clear_key_cache.call_count == 1
+
+        gp_cluster.clear_key()
+        assert 0x9998 not in gp_cluster._attr_cache
+        assert clear_key_cache.call_count == 2
+
+        gp_cluster.set_key(bytearray(GP_KEY))
+        assert gp_cluster._attr_cache[0x9998] == GP_KEY
+        assert clear_key_cache.call_count == 3
+
+        with pytest.raises(ValueError):
+            gp_cluster.set_key(GP_KEY[:15])
+        assert gp_cluster._attr_cache[0x9998] == GP_KEY
+        assert clear_key_cache.call_count == 3
+
+
+def test_gp_set_key_compat(gp_cluster):
+    with patch("zigpy.util.clear_key_cache") as clear_key_cache:
+        gp_cluster.setKey(0x000102030405060708090A0B0C0D0E0F)
+        assert gp_cluster._attr_cache[0x9998] == GP_KEY
+        assert clear_key_cache.call_count == 1
+
+        gp_cluster.setKey(None)
+        assert 0x9998 not in gp_cluster._attr_cache
+        assert clear_key_cache.call_count == 2
+
+
+async def test_gp_permit(gp_cluster):
+    app = gp_cluster.endpoint.device.application
+    app.get_sequence.return_value = 0x56
+    app.broadcast = AsyncMock()
+
+    await gp_cluster.permit(0x00B4)
+    assert app.broadcast.call_count == 1
+    assert app.broadcast.call_args[1]["sequence"] == 0x56
+    assert app.broadcast.call_args[1]["data"] == b"\x11\x56\x02\x0b\xb4\x00"
+
+    await gp_cluster.permit(0)
+    assert app.broadcast.call_args[1]["data"] == b"\x11\x56\x02\x0b\x00\x00"
+
+
+async def test_gp_permit_float(gp_cluster):
+    app = gp_cluster.endpoint.device.application
+    app.get_sequence.return_value = 0x56
+    app.broadcast = AsyncMock()
+
+    await gp_cluster.permit(60.7)
+    assert app.broadcast.call_args[1]["data"] == b"\x11\x56\x02\x0b\x3d\x00"
+
+    await gp_cluster.permit(253.6)
+    assert app.broadcast.call_args[1]["data"] == b"\x11\x56\x02\x0b\xfe\x00"
+
+
+@pytest.mark.parametrize("time_s", [-1, -0.5, 254.5, 255])
+async def test_gp_permit_invalid_duration(gp_cluster, time_s):
+    app = gp_cluster.endpoint.device.application
+    app.broadcast = AsyncMock()
+
+    with pytest.raises(ValueError):
+        await gp_cluster.permit(time_s)
+    assert 0x9997 not in gp_cluster._attr_cache
+    assert gp_cluster._permit_until == 0
+    assert app.broadcast.call_count == 0
+
+
+async def test_gp_permit_window(gp_cluster):
+    app = gp_cluster.endpoint.device.application
+    app.devices = {}
+    app.broadcast = AsyncMock()
+
+    assert gp_cluster.create_device(GP_IEEE) is None
+    assert app.add_device.call_count == 0
+
+    with patch("time.monotonic", return_value=1000.0), patch(
+        "time.time", return_value=1600000000.0
+    ):
+        await gp_cluster.permit(60)
+    assert gp_cluster._permit_until == 1060
+    assert gp_cluster._attr_cache[0x9997] == 1600000060
+
+    with patch("time.monotonic", return_value=1061.0):
+        assert gp_cluster.create_device(GP_IEEE) is None
+    assert app.add_device.call_count == 0
+
+    with patch("time.monotonic", return_value=1059.0):
+        gp_cluster.create_device(GP_IEEE)
+    assert app.add_device.call_count == 1
+
+
 @pytest.fixture
 def ota_cluster():
     ep = MagicMock()
@@ -219,6 +451,37 @@ async def test_ota_handle_query_next_image_not_upgradeable(ota_cluster):
     assert len(ota_cluster.query_next_image_response.call_args[0]) == 1
 
 
+async def test_ota_handle_query_next_image_no_img_cached(ota_cluster):
+    ota_cluster.query_next_image_response = AsyncMock()
+    get_ota_image = ota_cluster.endpoint.device.application.ota.get_ota_image
+
+    await _ota_next_image(ota_cluster, has_image=True, upgradeable=False)
+    await _ota_next_image(ota_cluster, has_image=True, upgradeable=False)
+    assert get_ota_image.call_count == 1
+    assert ota_cluster.query_next_image_response.call_count == 2
+    assert (
+        ota_cluster.query_next_image_response.call_args[0][0]
+        == zcl.foundation.Status.NO_IMAGE_AVAILABLE
+    )
+
+    # the cached answer expires
+    with patch("time.monotonic", return_value=time.monotonic() + 61):
+        await _ota_next_image(ota_cluster, has_image=False, upgradeable=False)
+    assert get_ota_image.call_count == 2
+
+    # and is dropped once an upgrade ends
+    ota_cluster.upgrade_end_response = AsyncMock()
+    await ota_cluster._handle_upgrade_end(
+        sentinel.status, sentinel.manufacturer_id, sentinel.image_type, 1, tsn=0x21
+    )
+    await _ota_next_image(ota_cluster, has_image=True, upgradeable=True)
+    assert get_ota_image.call_count == 3
+    assert (
+        ota_cluster.query_next_image_response.call_args[0][0]
+        == zcl.foundation.Status.SUCCESS
+    )
+
+
 async def test_ota_handle_query_next_image_upgradeable(ota_cluster):
     ota_cluster.query_next_image_response = AsyncMock()
 
@@ -386,6 +649,14 @@ def test_basic_cluster_power_source():
     assert pwr_src.value == 0x01
     assert pwr_src.battery_backup
 
+    pwr_src, rest = zcl.clusters.general.Basic.PowerSource.deserialize(b"\x03")
+    assert rest == b""
+    assert pwr_src == zcl.clusters.general.Basic.PowerSource.Battery
+    assert not pwr_src.battery_backup
+
+    with pytest.raises(ValueError):
+        zcl.clusters.general.Basic.PowerSource.deserialize(b"")
+
 
 @pytest.mark.parametrize(
     "raw, mode, name",
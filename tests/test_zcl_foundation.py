@@ -266,6 +266,23 @@ def test_frame_control_cluster():
     assert frc.serialize() == b"\x11"
 
 
+@pytest.mark.parametrize("data", [b"", b"\x18", b"\x18\xc0", b"\x1c_\x11\xc0"])
+def test_frame_header_too_short(data):
+    with pytest.raises(ValueError):
+        foundation.ZCLHeader.deserialize(data)
+
+
+def test_frame_header_cluster_command():
+    hdr, rest = foundation.ZCLHeader.deserialize(b"\x01\xc0\xfe\xaa")
+
+    assert rest == b"\xaa"
+    assert hdr.frame_control.is_cluster
+    assert hdr.command_id == 0xFE
+    assert type(hdr.command_id) is t.uint8_t
+    assert type(hdr.tsn) is t.uint8_t
+    assert hdr.manufacturer is None
+
+
 def test_frame_header():
     """Test frame header deserialization."""
     data = b"\x1c_\x11\xc0\n"
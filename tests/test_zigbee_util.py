@@ -175,7 +175,50 @@ async def test_retryable_once():
     assert counter == 2
 
 
-def test_zigbee_security_hash():
+@pytest.fixture(params=["cryptography", "pycryptodome"])
+def aes_backend(request):
+    util.clear_key_cache()
+
+    if request.param == "cryptography":
+        yield request.param
+    else:
+        with patch.object(util, "Cipher", None), patch.object(util, "AESCCM", None):
+            yield request.param
+
+    util.clear_key_cache()
+
+
+@pytest.mark.skipif(util.AESCCM is None, reason="only AESCCM contexts are cached")
+def test_aes_key_cache():
+    key = bytes.fromhex("c0c1c2c3c4c5c6c7c8c9cacbcccdcecf")
+    nonce = bytes.fromhex("00000003020100a0a1a2a3a4a5")
+    aad = bytes.fromhex("0001020304050607")
+
+    util.clear_key_cache()
+    util.aes_ccm_encrypt(key, nonce, b"", aad, 4)
+    util.aes_ccm_encrypt(key, nonce, b"", aad, 4)
+    assert util._aes_ccm.cache_info().misses == 1
+    assert util._aes_ccm.cache_info().hits == 1
+
+    util.clear_key_cache()
+    assert util._aes_ccm.cache_info().currsize == 0
+
+
+def test_aes_ccm_encrypt(aes_backend):
+    # RFC 3610, packet vector #1
+    key = bytes.fromhex("c0c1c2c3c4c5c6c7c8c9cacbcccdcecf")
+    nonce = bytes.fromhex("00000003020100a0a1a2a3a4a5")
+    aad = bytes.fromhex("0001020304050607")
+    plaintext = bytes.fromhex("08090a0b0c0d0e0f101112131415161718191a1b1c1d1e")
+    expected = bytes.fromhex(
+        "588c979a61c663d2f066d0c2c0f989806d5f6b61dac384"
+        "17e8d12cfdf926e0"
+    )
+
+    assert util.aes_ccm_encrypt(key, nonce, plaintext, aad, 8) == expected
+
+
+def test_zigbee_security_hash(aes_backend):
     message = bytes([0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88, 0x4A, 0xF7])
     key = util.aes_mmo_hash(message)
     assert key == [
@@ -297,6 +297,9 @@ class Device(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         self.rssi = rssi
 
     def log(self, lvl, msg, *args, **kwargs):
+        if not LOGGER.isEnabledFor(lvl):
+            return
+
         msg = "[0x%04x] " + msg
         args = (self.nwk,) + args
         return LOGGER.log(lvl, msg, *args, **kwargs)
@@ -249,6 +249,9 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         )
 
     def log(self, lvl, msg, *args, **kwargs):
+        if not LOGGER.isEnabledFor(lvl):
+            return
+
         msg = "[0x%04x:%s] " + msg
         args = (self._device.nwk, self._endpoint_id) + args
         return LOGGER.log(lvl, msg, *args, **kwargs)
@@ -111,8 +111,9 @@ class OTA(zigpy.util.ListenableMixin):
 
     async def get_ota_image(self, manufacturer_id, image_type) -> Optional[CachedImage]:
         key = ImageKey(manufacturer_id, image_type)
-        if key in self._image_cache and not self._image_cache[key].expired:
-            return self._image_cache[key]
+        cached = self._image_cache.get(key)
+        if cached is not None and not cached.expired:
+            return cached
 
         images = await self.async_event("get_image", key)
         valid_images = []
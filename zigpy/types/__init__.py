@@ -1,9 +1,44 @@
+import functools
+import struct as _struct
+
 from .basic import *  # noqa: F401,F403
+from .basic import FixedIntType
 from .named import *  # noqa: F401,F403
 from .struct import *  # noqa: F401,F403
 
 
+@functools.lru_cache(maxsize=None)
+def _fixed_schema_struct(schema):
+    """Single struct for schemas made only of plain integers with a struct format."""
+    fmt = "<"
+
+    for type_ in schema:
+        if (
+            not isinstance(type_, type)
+            or not issubclass(type_, FixedIntType)
+            or type_._struct is None
+            or not type_._plain_int
+            or type_.deserialize.__func__ is not FixedIntType.deserialize.__func__
+        ):
+            return None
+
+        fmt += type_._struct.format[1:]
+
+    return _struct.Struct(fmt)
+
+
 def deserialize(data, schema):
+    try:
+        fixed = _fixed_schema_struct(schema)
+    except TypeError:
+        # Unhashable schema
+        fixed = None
+
+    if fixed is not None and len(data) >= fixed.size:
+        values = fixed.unpack_from(data)
+        result = [int.__new__(type_, v) for type_, v in zip(schema, values)]
+        return result, data[fixed.size :]
+
     result = []
     for type_ in schema:
         value, data = type_.deserialize(data)
@@ -1,14 +1,24 @@
 import enum
+import functools
 import inspect
 import struct
 from typing import Callable, Tuple, TypeVar
 
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-name
 
+# Precompiled little endian structs for the sizes natively supported by `struct`
+_INT_STRUCTS = {
+    (size, signed): struct.Struct("<" + (fmt if signed else fmt.upper()))
+    for size, fmt in ((1, "b"), (2, "h"), (4, "i"), (8, "q"))
+    for signed in (False, True)
+}
+
 
 class FixedIntType(int):
     _signed = None
     _size = None
+    _struct = None
+    _plain_int = True
 
     def __new__(cls, *args, **kwargs):
         if cls._signed is None or cls._size is None:
@@ -28,6 +38,11 @@ class FixedIntType(int):
         if size is not None:
             cls._size = size
 
+        cls._struct = _INT_STRUCTS.get((cls._size, cls._signed))
+        # Enums and bitmaps have to be looked up by value and subclasses with their own
+        # constructor have to be called, only plain integers can skip `cls(value)`
+        cls._plain_int = not issubclass(cls, enum.Enum) and not _has_constructor(cls)
+
         if hex_repr:
             fmt = f"0x{{:0{cls._size * 2}X}}"
             cls.__str__ = cls.__repr__ = lambda self: fmt.format(self)
@@ -52,9 +67,36 @@ class FixedIntType(int):
         if len(data) < cls._size:
             raise ValueError(f"Data is too short to contain {cls._size} bytes")
 
-        r = cls.from_bytes(data[: cls._size], "little", signed=cls._signed)
-        data = data[cls._size :]
-        return r, data
+        if cls._struct is not None:
+            (value,) = cls._struct.unpack_from(data)
+        else:
+            value = int.from_bytes(data[: cls._size], "little", signed=cls._signed)
+
+        if cls._plain_int:
+            # The value was read from exactly `_size` bytes so it is always in range
+            return int.__new__(cls, value), data[cls._size :]
+
+        return cls(value), data[cls._size :]
+
+
+def _has_constructor(cls) -> bool:
+    """Check if a `FixedIntType` subclass defines its own `__new__` or `__init__`."""
+    for klass in cls.__mro__:
+        if klass is FixedIntType:
+            return False
+
+        if "__init__" in klass.__dict__:
+            return True
+
+        # `__init_subclass__` copies the inherited `__new__` into every subclass
+        new = klass.__dict__.get("__new__")
+        if isinstance(new, staticmethod):
+            new = new.__func__
+
+        if new is not None and new is not FixedIntType.__new__:
+            return True
+
+    return False
 
 
 class uint_t(FixedIntType, signed=False):
@@ -482,6 +524,31 @@ class FixedList(list, metaclass=KwargTypeMeta):
         return r, data
 
 
+class FixedBytes(bytes, metaclass=KwargTypeMeta):
+    _length = None
+
+    _getitem_kwargs = {"length": None}
+
+    def serialize(self) -> bytes:
+        assert self._length is not None
+
+        if len(self) != self._length:
+            raise ValueError(
+                f"Invalid length for {self!r}: expected {self._length}, got {len(self)}"
+            )
+
+        return bytes(self)
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> Tuple["FixedBytes", bytes]:
+        assert cls._length is not None
+
+        if len(data) < cls._length:
+            raise ValueError(f"Data is too short to contain {cls._length} bytes")
+
+        return cls(data[: cls._length]), data[cls._length :]
+
+
 class CharacterString(str):
     _prefix_length = 1
 
@@ -524,7 +591,9 @@ def LimitedCharString(max_len):  # noqa: N802
     return LimitedCharString
 
 
+@functools.lru_cache(maxsize=None)
 def Optional(optional_item_type):
+    # Cached so every `Optional(t.uint16_t)` in the cluster tables is the same class
     class Optional(optional_item_type):
         optional = True
 
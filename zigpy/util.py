@@ -5,16 +5,24 @@ import inspect
 import logging
 import sys
 import traceback
-from typing import Any, Coroutine, Dict, Optional, Tuple, Type, Union
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple, Type, Union
 
-from Crypto.Cipher import AES
 from crccheck.crc import CrcX25
 
+try:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+except ImportError:  # pragma: no cover
+    Cipher = AESCCM = None
+
 from zigpy.exceptions import ControllerException, ZigbeeException
 import zigpy.types as t
 
 LOGGER = logging.getLogger(__name__)
 
+AES_BLOCK_SIZE = 16
+
 
 class ListenableMixin:
     _listeners: Dict
@@ -145,18 +153,68 @@ def retryable(retry_exceptions, tries=1, delay=0.1):
 retryable_request = retryable((ZigbeeException, asyncio.TimeoutError))
 
 
+def aes_ccm_encrypt(
+    key: bytes, nonce: bytes, plaintext: bytes, aad: bytes, tag_length: int
+) -> bytes:
+    """Encrypt and authenticate with AES-CCM, returning the ciphertext and the tag.
+
+    CBC-MAC and CTR are both done by a single AEAD call, in OpenSSL when
+    `cryptography` is installed. PyCryptodome is used otherwise and is only
+    imported when needed. Zigbee security uses this with an empty plaintext to
+    compute a MIC over authenticated-only data.
+    """
+    if AESCCM is not None:
+        return _aes_ccm(key, tag_length).encrypt(nonce, plaintext, aad)
+
+    from Crypto.Cipher import AES
+
+    cipher = AES.new(key, AES.MODE_CCM, nonce=nonce, mac_len=tag_length)
+    cipher.update(aad)
+    ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+    return ciphertext + tag
+
+
+@functools.lru_cache(maxsize=32)
+def _aes_ccm(key: bytes, tag_length: int) -> "AESCCM":
+    return AESCCM(key, tag_length=tag_length)
+
+
+def _new_aes_ecb(key: bytes) -> Callable[[bytes], bytes]:
+    """Return an ECB encryption function for a key that is used only once."""
+    if Cipher is not None:
+        return (
+            Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
+            .encryptor()
+            .update
+        )
+
+    from Crypto.Cipher import AES
+
+    return AES.new(key, AES.MODE_ECB).encrypt
+
+
+def clear_key_cache() -> None:
+    """Drop all cached AES contexts, e.g. after a key has been replaced."""
+    _aes_ccm.cache_clear()
+
+
+def _xor16(a: bytes, b: bytes) -> bytes:
+    """XOR two 16 byte blocks as 128-bit integers instead of byte by byte."""
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(
+        AES_BLOCK_SIZE, "big"
+    )
+
+
 def aes_mmo_hash_update(length, result, data):
-    while len(data) >= AES.block_size:
-        # Encrypt
-        aes = AES.new(bytes(result), AES.MODE_ECB)
-        result = bytearray(aes.encrypt(bytes(data[: AES.block_size])))
+    while len(data) >= AES_BLOCK_SIZE:
+        block = bytes(data[:AES_BLOCK_SIZE])
 
-        # XOR
-        for i in range(AES.block_size):
-            result[i] ^= bytes(data[: AES.block_size])[i]
+        # Encrypt, every block is encrypted with a different key so nothing is cached
+        encrypt = _new_aes_ecb(bytes(result))
+        result = _xor16(encrypt(block), block)
 
-        data = data[AES.block_size :]
-        length += AES.block_size
+        data = data[AES_BLOCK_SIZE:]
+        length += AES_BLOCK_SIZE
 
     return (length, result)
 
@@ -165,16 +223,16 @@ def aes_mmo_hash(data):
     result_len = 0
     remaining_length = 0
     length = len(data)
-    result = bytearray([0] * AES.block_size)
-    temp = bytearray([0] * AES.block_size)
+    result = bytearray([0] * AES_BLOCK_SIZE)
+    temp = bytearray([0] * AES_BLOCK_SIZE)
 
     if data and length > 0:
-        remaining_length = length & (AES.block_size - 1)
-        if length >= AES.block_size:
+        remaining_length = length & (AES_BLOCK_SIZE - 1)
+        if length >= AES_BLOCK_SIZE:
             # Mask out the lower byte since hash update will hash
             # everything except the last piece, if the last piece
             # is less than 16 bytes.
-            hashed_length = length & ~(AES.block_size - 1)
+            hashed_length = length & ~(AES_BLOCK_SIZE - 1)
             (result_len, result) = aes_mmo_hash_update(result_len, result, data)
             data = data[hashed_length:]
 
@@ -188,18 +246,18 @@ def aes_mmo_hash(data):
 
     # If appending the bit string will push us beyond the 16-byte boundary
     # we must hash that block and append another 16-byte block.
-    if (AES.block_size - remaining_length) < 3:
+    if (AES_BLOCK_SIZE - remaining_length) < 3:
         (result_len, result) = aes_mmo_hash_update(result_len, result, temp)
 
         # Since this extra data is due to the concatenation,
         # we remove that length. We want the length of data only
         # and not the padding.
-        result_len -= AES.block_size
-        temp = bytearray([0] * AES.block_size)
+        result_len -= AES_BLOCK_SIZE
+        temp = bytearray([0] * AES_BLOCK_SIZE)
 
     bit_size = result_len * 8
-    temp[AES.block_size - 2] = (bit_size >> 8) & 0xFF
-    temp[AES.block_size - 1] = (bit_size) & 0xFF
+    temp[AES_BLOCK_SIZE - 2] = (bit_size >> 8) & 0xFF
+    temp[AES_BLOCK_SIZE - 1] = (bit_size) & 0xFF
 
     (result_len, result) = aes_mmo_hash_update(result_len, result, temp)
 
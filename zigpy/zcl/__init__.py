@@ -2,7 +2,20 @@ import asyncio
 import enum
 import functools
 import logging
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
+import sys
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from zigpy import util
 import zigpy.types as t
@@ -18,23 +31,30 @@ class Registry(type):
 
         if hasattr(cls, "cluster_id"):
             cls.cluster_id = t.ClusterId(cls.cluster_id)
+        if isinstance(nmspc.get("ep_attribute"), str):
+            cls.ep_attribute = sys.intern(cls.ep_attribute)
         manufacturer_attributes = getattr(cls, "manufacturer_attributes", None)
         if manufacturer_attributes:
             cls.attributes = {**cls.attributes, **manufacturer_attributes}
-        cls.attridx: Dict[str, int] = {
-            attr_name: attr_id for attr_id, (attr_name, _) in cls.attributes.items()
-        }
 
         for commands_type in ("server_commands", "client_commands"):
-            commands = getattr(cls, commands_type, None)
             manufacturer_specific = getattr(cls, f"manufacturer_{commands_type}", {})
-            commands_idx = {}
             if manufacturer_specific:
-                commands = {**commands, **manufacturer_specific}
+                commands = {**getattr(cls, commands_type), **manufacturer_specific}
                 setattr(cls, commands_type, commands)
-            for command_id, (command_name, _, _) in commands.items():
-                commands_idx[command_name] = command_id
-            setattr(cls, f"_{commands_type}_idx", commands_idx)
+
+        # The name indexes are cached per class, so the definitions must not change
+        if not isinstance(cls.attributes, MappingProxyType):
+            cls.attributes = MappingProxyType(
+                {
+                    attr_id: _shared_tuple(attr_def)
+                    for attr_id, attr_def in cls.attributes.items()
+                }
+            )
+        for commands_type in ("server_commands", "client_commands"):
+            commands = getattr(cls, commands_type)
+            if not isinstance(commands, MappingProxyType):
+                setattr(cls, commands_type, _frozen_commands(commands))
 
         if getattr(cls, "_skip_registry", False):
             if cls.__name__ != "CustomCluster":
@@ -46,6 +66,88 @@ class Registry(type):
         if hasattr(cls, "cluster_id_range"):
             cls._registry_range[cls.cluster_id_range] = cls
 
+    def _cached_index(cls, cache_name: str, build: Callable) -> Dict:  # noqa: N805
+        """Build a name index on first access and cache it on this exact class.
+
+        Most clusters are never instantiated, so the indexes are not built at import.
+        Names are interned by the builders so lookups by a literal name hit the
+        identity fast path, even for names built at runtime by quirks.
+        """
+        try:
+            return cls.__dict__[cache_name]
+        except KeyError:
+            pass
+
+        index = build()
+        setattr(cls, cache_name, index)
+        return index
+
+    @property
+    def attridx(cls) -> Dict[str, int]:  # noqa: N805
+        return cls._cached_index(
+            "_attridx_cache",
+            lambda: {
+                sys.intern(attr_name): attr_id
+                for attr_id, (attr_name, _) in cls.attributes.items()
+            },
+        )
+
+    @property
+    def attributes_by_name(cls) -> Mapping[str, Tuple[int, Callable]]:  # noqa: N805
+        return cls._cached_index(
+            "_attributes_by_name_cache",
+            lambda: MappingProxyType(
+                {
+                    sys.intern(attr_name): (attr_id, attr_type)
+                    for attr_id, (attr_name, attr_type) in cls.attributes.items()
+                }
+            ),
+        )
+
+    @property
+    def _server_commands_idx(cls) -> Dict[str, int]:  # noqa: N805
+        return cls._cached_index(
+            "_server_commands_idx_cache",
+            lambda: _commands_index(cls.server_commands),
+        )
+
+    @property
+    def _client_commands_idx(cls) -> Dict[str, int]:  # noqa: N805
+        return cls._cached_index(
+            "_client_commands_idx_cache",
+            lambda: _commands_index(cls.client_commands),
+        )
+
+
+# Identical attribute definitions and command schemas are shared between clusters
+_SHARED_TUPLES: Dict[Tuple, Tuple] = {}
+
+
+def _shared_tuple(value: Tuple) -> Tuple:
+    try:
+        return _SHARED_TUPLES.setdefault(value, value)
+    except TypeError:
+        # Not hashable, keep it as is
+        return value
+
+
+def _frozen_commands(
+    commands: Dict[int, Tuple[str, Tuple, bool]]
+) -> Mapping[int, Tuple[str, Tuple, bool]]:
+    return MappingProxyType(
+        {
+            command_id: (name, _shared_tuple(schema), is_reply)
+            for command_id, (name, schema, is_reply) in commands.items()
+        }
+    )
+
+
+def _commands_index(commands: Dict[int, Tuple[str, Tuple, bool]]) -> Dict[str, int]:
+    return {
+        sys.intern(command_name): command_id
+        for command_id, (command_name, _, _) in commands.items()
+    }
+
 
 class ClusterType(enum.IntEnum):
     Server = 0
@@ -58,9 +160,6 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
     _registry: Dict = {}
     _registry_custom_clusters: Set = set()
     _registry_range: Dict = {}
-    _server_commands_idx: Dict[str, int] = {}
-    _client_commands_idx: Dict[str, int] = {}
-    attridx: Dict[str, int]
     attributes: Dict[int, Tuple[str, Callable]] = {}
     client_commands: Dict[int, Tuple[str, Tuple, bool]] = {}
     server_commands: Dict[int, Tuple[str, Tuple, bool]] = {}
@@ -104,20 +203,20 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
                 commands = self.server_commands
 
             try:
-                schema = commands[hdr.command_id][1]
-                hdr.frame_control.is_reply = commands[hdr.command_id][2]
+                _, schema, is_reply = commands[hdr.command_id]
             except KeyError:
                 self.warning("Unknown cluster-specific command %s", hdr.command_id)
                 return hdr, data
         else:
             # General command
             try:
-                schema = foundation.COMMANDS[hdr.command_id][0]
-                hdr.frame_control.is_reply = foundation.COMMANDS[hdr.command_id][1]
+                schema, is_reply = foundation.COMMANDS[hdr.command_id]
             except KeyError:
                 self.warning("Unknown foundation command %s", hdr.command_id)
                 return hdr, data
 
+        hdr.frame_control.is_reply = is_reply
+
         value, data = t.deserialize(data, schema)
         if data != b"":
             self.warning("Data remains after deserializing ZCL frame")
@@ -225,13 +324,14 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
         ] = None,
     ) -> None:
         if hdr.command_id == foundation.Command.Report_Attributes:
-            valuestr = ", ".join(
-                [
-                    f"{self.attributes.get(a.attrid, [a.attrid])[0]}={a.value.value}"
-                    for a in args[0]
-                ]
-            )
-            self.debug("Attribute report received: %s", valuestr)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                valuestr = ", ".join(
+                    [
+                        f"{self.attributes.get(a.attrid, [a.attrid])[0]}={a.value.value}"
+                        for a in args[0]
+                    ]
+                )
+                self.debug("Attribute report received: %s", valuestr)
             for attr in args[0]:
                 try:
                     value = self.attributes[attr.attrid][1](attr.value.value)
@@ -347,15 +447,16 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
         args = []
         for attrid, value in attributes.items():
             if isinstance(attrid, str):
-                attrid = self.attridx[attrid]
-            if attrid not in self.attributes:
+                attrid, python_type = self.attributes_by_name[attrid]
+            elif attrid in self.attributes:
+                python_type = self.attributes[attrid][1]
+            else:
                 self.error("%d is not a valid attribute id", attrid)
                 continue
 
             a = foundation.Attribute(attrid, foundation.TypeValue())
 
             try:
-                python_type = self.attributes[attrid][1]
                 a.value.type = foundation.DATA_TYPES.pytype_to_datatype_id(python_type)
                 a.value.value = python_type(value)
                 args.append(a)
@@ -405,18 +506,17 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
         direction: int = 0x00,
     ) -> foundation.ConfigureReportingResponseRecord:
         if isinstance(attribute, str):
-            attrid = self.attridx.get(attribute)
+            attrid, python_type = self.attributes_by_name.get(attribute, (None, None))
         else:
             attrid = attribute
-        if attrid is None or attrid not in self.attributes:
+            python_type = self.attributes.get(attrid, (None, None))[1]
+        if python_type is None:
             raise ValueError(f"Unknown {attribute} name of {self.ep_attribute} cluster")
 
         cfg = foundation.AttributeReportingConfig()
         cfg.direction = direction
         cfg.attrid = attrid
-        cfg.datatype = foundation.DATA_TYPES.pytype_to_datatype_id(
-            self.attributes.get(attrid, (None, foundation.Unknown))[1]
-        )
+        cfg.datatype = foundation.DATA_TYPES.pytype_to_datatype_id(python_type)
         cfg.min_interval = min_interval
         cfg.max_interval = max_interval
         cfg.reportable_change = reportable_change
@@ -490,6 +590,22 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
             False, command_id, schema, *args, manufacturer=manufacturer, tsn=tsn
         )
 
+    @property
+    def attridx(self) -> Dict[str, int]:
+        return type(self).attridx
+
+    @property
+    def attributes_by_name(self) -> Mapping[str, Tuple[int, Callable]]:
+        return type(self).attributes_by_name
+
+    @property
+    def _server_commands_idx(self) -> Dict[str, int]:
+        return type(self)._server_commands_idx
+
+    @property
+    def _client_commands_idx(self) -> Dict[str, int]:
+        return type(self)._client_commands_idx
+
     @property
     def is_client(self) -> bool:
         """Return True if this is a client cluster."""
@@ -517,6 +633,9 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
         self.listener_event("attribute_updated", attrid, value)
 
     def log(self, lvl, msg, *args, **kwargs):
+        if not LOGGER.isEnabledFor(lvl):
+            return
+
         msg = "[0x%04x:%s:0x%04x] " + msg
         args = (
             self._endpoint.device.nwk,
@@ -526,14 +645,15 @@ class Cluster(util.ListenableMixin, util.CatchingTaskMixin, metaclass=Registry):
         return LOGGER.log(lvl, msg, *args, **kwargs)
 
     def __getattr__(self, name):
-        if name in self._client_commands_idx:
-            return functools.partial(
-                self.client_command, self._client_commands_idx[name]
-            )
-        elif name in self._server_commands_idx:
-            return functools.partial(self.command, self._server_commands_idx[name])
-        else:
-            raise AttributeError("No such command name: %s" % (name,))
+        command_id = self._client_commands_idx.get(name)
+        if command_id is not None:
+            return functools.partial(self.client_command, command_id)
+
+        command_id = self._server_commands_idx.get(name)
+        if command_id is not None:
+            return functools.partial(self.command, command_id)
+
+        raise AttributeError("No such command name: %s" % (name,))
 
     def get(self, key: Union[int, str], default: Optional[Any] = None) -> Any:
         """Get cached attribute."""
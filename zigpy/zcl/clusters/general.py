@@ -1,13 +1,11 @@
 """General Functional Domain"""
 
-import collections
-from datetime import datetime
+import hmac
 import logging
+import struct
 import time
-from typing import Any, List, Optional, Tuple, Union
-
-from Crypto.Cipher import AES
-from Crypto.Util import Counter
+from types import MappingProxyType
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import zigpy
 import zigpy.types as t
@@ -15,6 +13,9 @@ from zigpy.zcl import Cluster, foundation
 
 LOGGER = logging.getLogger(__name__)
 
+# Seconds between the Unix epoch and the ZCL epoch, 2000-01-01 00:00:00 UTC
+ZCL_EPOCH = 946684800
+
 
 class Basic(Cluster):
     """Attributes for determining basic information about a
@@ -38,10 +39,13 @@ class Basic(Cluster):
 
         @classmethod
         def deserialize(cls, data: bytes) -> Tuple[bytes, bytes]:
-            val, data = t.uint8_t.deserialize(data)
-            r = cls(val & 0x7F)
-            r.battery_backup = bool(val & 0x80)
-            return r, data
+            if not data:
+                raise ValueError("Data is too short to contain 1 bytes")
+
+            # The raw byte is enough, there is no need for an intermediate uint8_t
+            r = cls(data[0] & 0x7F)
+            r.battery_backup = bool(data[0] & 0x80)
+            return r, data[1:]
 
     class PhysicalEnvironment(t.enum8):
         Unspecified_environment = 0x00
@@ -521,24 +525,18 @@ class Time(Cluster):
         ] = None,
     ):
         if hdr.command_id == foundation.Command.Read_Attributes:
-            # responses should be in the same order. Is it time to ditch py35?
-            data = collections.OrderedDict()
+            # dicts preserve insertion order, so responses keep the requested order
+            data = {}
+            now = time.time()
             for attr in args[0][0]:
                 if attr == 0:
-                    epoch = datetime(2000, 1, 1, 0, 0, 0, 0)
-                    diff = datetime.utcnow() - epoch
-                    data[attr] = diff.total_seconds()
+                    data[attr] = now - ZCL_EPOCH
                 elif attr == 1:
                     data[attr] = 7
                 elif attr == 2:
-                    diff = datetime.fromtimestamp(86400) - datetime.utcfromtimestamp(
-                        86400
-                    )
-                    data[attr] = diff.total_seconds()
+                    data[attr] = -time.timezone
                 elif attr == 7:
-                    epoch = datetime(2000, 1, 1, 0, 0, 0, 0)
-                    diff = datetime.now() - epoch
-                    data[attr] = diff.total_seconds()
+                    data[attr] = now - ZCL_EPOCH + time.localtime(now).tm_gmtoff
                 else:
                     data[attr] = None
             self.create_catching_task(self.read_attributes_rsp(data, tsn=hdr.tsn))
@@ -639,20 +637,29 @@ class RSSILocation(Cluster):
     }
 
 
+# Attributes shared by the Analog, Binary and Multistate Input/Output/Value clusters,
+# which are modelled after the BACnet objects of the same name
+_BACNET_COMMON = MappingProxyType(
+    {
+        0x001C: ("description", t.CharacterString),
+        0x0051: ("out_of_service", t.Bool),
+        0x0067: ("reliability", t.enum8),
+        0x006F: ("status_flags", t.bitmap8),
+        0x0100: ("application_type", t.uint32_t),
+    }
+)
+
+
 class AnalogInput(Cluster):
     cluster_id = 0x000C
     ep_attribute = "analog_input"
     attributes = {
-        0x001C: ("description", t.CharacterString),
+        **_BACNET_COMMON,
         0x0041: ("max_present_value", t.Single),
         0x0045: ("min_present_value", t.Single),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
-        0x0067: ("reliability", t.enum8),
         0x006A: ("resolution", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
         0x0075: ("engineering_units", t.enum16),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -662,19 +669,15 @@ class AnalogOutput(Cluster):
     cluster_id = 0x000D
     ep_attribute = "analog_output"
     attributes = {
-        0x001C: ("description", t.CharacterString),
+        **_BACNET_COMMON,
         0x0041: ("max_present_value", t.Single),
         0x0045: ("min_present_value", t.Single),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Single),
         0x006A: ("resolution", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
         0x0075: ("engineering_units", t.enum16),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -684,16 +687,12 @@ class AnalogValue(Cluster):
     cluster_id = 0x000E
     ep_attribute = "analog_value"
     attributes = {
-        0x001C: ("description", t.CharacterString),
-        0x0051: ("out_of_service", t.Bool),
+        **_BACNET_COMMON,
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
         0x0075: ("engineering_units", t.enum16),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -704,15 +703,11 @@ class BinaryInput(Cluster):
     name = "Binary Input (Basic)"
     ep_attribute = "binary_input"
     attributes = {
+        **_BACNET_COMMON,
         0x0004: ("active_text", t.CharacterString),
-        0x001C: ("description", t.CharacterString),
         0x002E: ("inactive_text", t.CharacterString),
-        0x0051: ("out_of_service", t.Bool),
         0x0054: ("polarity", t.enum8),
         0x0055: ("present_value", t.Bool),
-        0x0067: ("reliability", t.enum8),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -722,20 +717,16 @@ class BinaryOutput(Cluster):
     cluster_id = 0x0010
     ep_attribute = "binary_output"
     attributes = {
+        **_BACNET_COMMON,
         0x0004: ("active_text", t.CharacterString),
-        0x001C: ("description", t.CharacterString),
         0x002E: ("inactive_text", t.CharacterString),
         0x0042: ("minimum_off_time", t.uint32_t),
         0x0043: ("minimum_on_time", t.uint32_t),
-        0x0051: ("out_of_service", t.Bool),
         0x0054: ("polarity", t.enum8),
         0x0055: ("present_value", t.Bool),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Bool),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -745,19 +736,15 @@ class BinaryValue(Cluster):
     cluster_id = 0x0011
     ep_attribute = "binary_value"
     attributes = {
+        **_BACNET_COMMON,
         0x0004: ("active_text", t.CharacterString),
-        0x001C: ("description", t.CharacterString),
         0x002E: ("inactive_text", t.CharacterString),
         0x0042: ("minimum_off_time", t.uint32_t),
         0x0043: ("minimum_on_time", t.uint32_t),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -767,16 +754,12 @@ class MultistateInput(Cluster):
     cluster_id = 0x0012
     ep_attribute = "multistate_input"
     attributes = {
+        **_BACNET_COMMON,
         0x000E: ("state_text", t.List[t.CharacterString]),
-        0x001C: ("description", t.CharacterString),
         0x004A: ("number_of_states", t.uint16_t),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -786,17 +769,13 @@ class MultistateOutput(Cluster):
     cluster_id = 0x0013
     ep_attribute = "multistate_output"
     attributes = {
+        **_BACNET_COMMON,
         0x000E: ("state_text", t.List[t.CharacterString]),
-        0x001C: ("description", t.CharacterString),
         0x004A: ("number_of_states", t.uint16_t),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -806,17 +785,13 @@ class MultistateValue(Cluster):
     cluster_id = 0x0014
     ep_attribute = "multistate_value"
     attributes = {
+        **_BACNET_COMMON,
         0x000E: ("state_text", t.List[t.CharacterString]),
-        0x001C: ("description", t.CharacterString),
         0x004A: ("number_of_states", t.uint16_t),
-        0x0051: ("out_of_service", t.Bool),
         0x0055: ("present_value", t.Single),
         # 0x0057: ('priority_array', TODO.array),  # Array of 16 structures of (boolean,
         # single precision)
-        0x0067: ("reliability", t.enum8),
         0x0068: ("relinquish_default", t.Single),
-        0x006F: ("status_flags", t.bitmap8),
-        0x0100: ("application_type", t.uint32_t),
     }
     server_commands = {}
     client_commands = {}
@@ -838,10 +813,10 @@ class Commissioning(Cluster):
         0x0005: ("stack_profile", t.uint8_t),
         0x0006: ("startup_control", t.enum8),
         0x0010: ("trust_center_address", t.EUI64),
-        0x0011: ("trust_center_master_key", t.FixedList[16, t.uint8_t]),
-        0x0012: ("network_key", t.FixedList[16, t.uint8_t]),
+        0x0011: ("trust_center_master_key", t.FixedBytes[16]),
+        0x0012: ("network_key", t.FixedBytes[16]),
         0x0013: ("use_insecure_join", t.Bool),
-        0x0014: ("preconfigured_link_key", t.FixedList[16, t.uint8_t]),
+        0x0014: ("preconfigured_link_key", t.FixedBytes[16]),
         0x0015: ("network_key_seq_num", t.uint8_t),
         0x0016: ("network_key_type", t.enum8),
         0x0017: ("network_manager_address", t.uint16_t),
@@ -994,6 +969,18 @@ class Ota(Cluster):
             True,
         ),
     }
+    # command id: name of the handler method
+    _OTA_HANDLERS = {
+        0x0001: "_handle_query_next_image",
+        0x0003: "_handle_image_block",
+        0x0006: "_handle_upgrade_end",
+    }
+    # how long a device is told there is no update without asking the OTA providers
+    NO_IMAGE_CACHE_TIMEOUT = 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._no_image_cache: Dict[Tuple, float] = {}
 
     def handle_cluster_request(
         self,
@@ -1018,16 +1005,12 @@ class Ota(Cluster):
         ] = None,
     ):
         """Parse OTA commands."""
-        tsn, command_id = hdr.tsn, hdr.command_id
-        cmd_name = self.server_commands.get(command_id, [command_id])[0]
-
-        if cmd_name == "query_next_image":
-            await self._handle_query_next_image(*args, tsn=tsn)
-        elif cmd_name == "image_block":
-            await self._handle_image_block(*args, tsn=tsn)
-        elif cmd_name == "upgrade_end":
-            await self._handle_upgrade_end(*args, tsn=tsn)
+        handler = self._OTA_HANDLERS.get(hdr.command_id)
+
+        if handler is not None:
+            await getattr(self, handler)(*args, tsn=hdr.tsn)
         else:
+            cmd_name = self.server_commands.get(hdr.command_id, [hdr.command_id])[0]
             self.debug(
                 "no '%s' OTA command handler for '%s %s': %s",
                 cmd_name,
@@ -1061,6 +1044,15 @@ class Ota(Cluster):
             hardware_version,
         )
 
+        # devices ask again on every poll cycle, usually for an unchanged answer
+        key = (manufacturer_id, image_type, current_file_version, hardware_version)
+        if self._no_image_cache.get(key, 0) > time.monotonic():
+            self.debug("No OTA image is available (cached)")
+            await self.query_next_image_response(
+                foundation.Status.NO_IMAGE_AVAILABLE, tsn=tsn
+            )
+            return
+
         img = await self.endpoint.device.application.ota.get_ota_image(
             manufacturer_id, image_type
         )
@@ -1076,6 +1068,7 @@ class Ota(Cluster):
                 should_update,
             )
             if should_update:
+                self._no_image_cache.pop(key, None)
                 self.info(
                     "Updating: %s %s", self.endpoint.manufacturer, self.endpoint.model
                 )
@@ -1090,6 +1083,7 @@ class Ota(Cluster):
                 return
         else:
             self.debug("No OTA image is available")
+        self._no_image_cache[key] = time.monotonic() + self.NO_IMAGE_CACHE_TIMEOUT
         await self.query_next_image_response(
             foundation.Status.NO_IMAGE_AVAILABLE, tsn=tsn
         )
@@ -1165,6 +1159,7 @@ class Ota(Cluster):
             image_type,
             file_ver,
         )
+        self._no_image_cache.clear()
         await self.upgrade_end_response(
             manufacturer_id, image_type, file_ver, 0x00000000, 0x00000000, tsn=tsn
         )
@@ -1307,6 +1302,33 @@ class PollControl(Cluster):
     client_commands = {0x0000: ("checkin", (), False)}
 
 
+# header, source id, frame counter and command id of a GPDF notification
+_GP_NOTIFICATION = struct.Struct("<2s4s4sB")
+
+
+def _gp_permit_template() -> bytes:
+    hdr = foundation.ZCLHeader.cluster(0, 2)  # commissioning
+    hdr.frame_control.disable_default_response = True
+    return hdr.serialize() + t.serialize((0x0B, 0), (t.uint8_t, t.uint16_t))
+
+
+# permit frame with a zero tsn and window, both are patched in on every call
+_GP_PERMIT_TEMPLATE = _gp_permit_template()
+_GP_PERMIT_TSN_OFFSET = 1
+_GP_PERMIT_TIME = struct.Struct("<H")
+
+
+class GreenPowerCommand(NamedTuple):
+    """A Green Power command and the ZCL command it is translated to."""
+
+    name: str
+    type: str
+    schema: Tuple
+    cluster_id: Optional[int]
+    zcl_command_id: Optional[int]
+    value: Tuple
+
+
 class GreenPowerProxy(Cluster):
     cluster_id = 0x0021
     ep_attribute = "green_power"
@@ -1335,9 +1357,11 @@ class GreenPowerProxy(Cluster):
         0x0009: ("pairing_configuration", (t.Struct,), False),
     }
     command = {
-        0x00: ("Identify", "CLUSTER_COMMAND", (), None, None, ()),
-        0x10: ("Scene 0", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 0)),
-        0x11: (
+        0x00: GreenPowerCommand("Identify", "CLUSTER_COMMAND", (), None, None, ()),
+        0x10: GreenPowerCommand(
+            "Scene 0", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 0)
+        ),
+        0x11: GreenPowerCommand(
             "Scene 1",
             "CLUSTER_COMMAND",
             (),
@@ -1348,27 +1372,59 @@ class GreenPowerProxy(Cluster):
                 1,
             ),
         ),
-        0x12: ("Scene 2", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 2)),
-        0x13: ("Scene 3", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 3)),
-        0x14: ("Scene 4", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 4)),
-        0x15: ("Scene 5", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 5)),
-        0x17: ("Scene 7", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 6)),
-        0x16: ("Scene 6", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 7)),
-        0x18: ("Scene 8", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 8)),
-        0x19: ("Scene 9", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 9)),
-        0x1A: ("Scene 10", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 10)),
-        0x1B: ("Scene 11", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 11)),
-        0x1C: ("Scene 12", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 12)),
-        0x1D: ("Scene 13", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 13)),
-        0x1E: ("Scene 14", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 14)),
-        0x1F: ("Scene 15", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 15)),
-        0x20: ("Off", "CLUSTER_COMMAND", (), 0x0006, 0x0000, ()),
-        0x21: ("On", "CLUSTER_COMMAND", (), 0x0006, 0x0001, ()),
-        0x22: ("Toggle", "CLUSTER_COMMAND", (), 0x0006, 0x0002, ()),
-        0x23: ("Release", "CLUSTER_COMMAND", (), None, None, ()),
-        0x30: ("Move Up", "CLUSTER_COMMAND", (t.uint8_t,), 0x0008, 0x0001, (1,)),
-        0x31: ("Move Down", "CLUSTER_COMMAND", (t.uint8_t,), 0x0008, 0x0000, (0,)),
-        0x32: (
+        0x12: GreenPowerCommand(
+            "Scene 2", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 2)
+        ),
+        0x13: GreenPowerCommand(
+            "Scene 3", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 3)
+        ),
+        0x14: GreenPowerCommand(
+            "Scene 4", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 4)
+        ),
+        0x15: GreenPowerCommand(
+            "Scene 5", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 5)
+        ),
+        0x17: GreenPowerCommand(
+            "Scene 7", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 6)
+        ),
+        0x16: GreenPowerCommand(
+            "Scene 6", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 7)
+        ),
+        0x18: GreenPowerCommand(
+            "Scene 8", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 8)
+        ),
+        0x19: GreenPowerCommand(
+            "Scene 9", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 9)
+        ),
+        0x1A: GreenPowerCommand(
+            "Scene 10", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 10)
+        ),
+        0x1B: GreenPowerCommand(
+            "Scene 11", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 11)
+        ),
+        0x1C: GreenPowerCommand(
+            "Scene 12", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 12)
+        ),
+        0x1D: GreenPowerCommand(
+            "Scene 13", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 13)
+        ),
+        0x1E: GreenPowerCommand(
+            "Scene 14", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 14)
+        ),
+        0x1F: GreenPowerCommand(
+            "Scene 15", "CLUSTER_COMMAND", (), 0x0005, 0x0001, (0, 15)
+        ),
+        0x20: GreenPowerCommand("Off", "CLUSTER_COMMAND", (), 0x0006, 0x0000, ()),
+        0x21: GreenPowerCommand("On", "CLUSTER_COMMAND", (), 0x0006, 0x0001, ()),
+        0x22: GreenPowerCommand("Toggle", "CLUSTER_COMMAND", (), 0x0006, 0x0002, ()),
+        0x23: GreenPowerCommand("Release", "CLUSTER_COMMAND", (), None, None, ()),
+        0x30: GreenPowerCommand(
+            "Move Up", "CLUSTER_COMMAND", (t.uint8_t,), 0x0008, 0x0001, (1,)
+        ),
+        0x31: GreenPowerCommand(
+            "Move Down", "CLUSTER_COMMAND", (t.uint8_t,), 0x0008, 0x0000, (0,)
+        ),
+        0x32: GreenPowerCommand(
             "Step Up",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1376,7 +1432,7 @@ class GreenPowerProxy(Cluster):
             0x0002,
             (1,),
         ),
-        0x33: (
+        0x33: GreenPowerCommand(
             "Step Down",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1384,8 +1440,10 @@ class GreenPowerProxy(Cluster):
             0x0002,
             (0,),
         ),
-        0x34: ("Level Control/Stop", "CLUSTER_COMMAND", (), 0x0008, 0x0007, ()),
-        0x35: (
+        0x34: GreenPowerCommand(
+            "Level Control/Stop", "CLUSTER_COMMAND", (), 0x0008, 0x0007, ()
+        ),
+        0x35: GreenPowerCommand(
             "Move Up (with On/Off)",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1393,7 +1451,7 @@ class GreenPowerProxy(Cluster):
             0x0005,
             (1,),
         ),
-        0x36: (
+        0x36: GreenPowerCommand(
             "Move Down (with On/Off)",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1401,7 +1459,7 @@ class GreenPowerProxy(Cluster):
             0x0005,
             (0,),
         ),
-        0x37: (
+        0x37: GreenPowerCommand(
             "Step Up (with On/Off)",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1409,7 +1467,7 @@ class GreenPowerProxy(Cluster):
             0x0006,
             (1,),
         ),
-        0x38: (
+        0x38: GreenPowerCommand(
             "Step Down (with On/Off)",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1417,8 +1475,10 @@ class GreenPowerProxy(Cluster):
             0x0006,
             (0,),
         ),
-        0x40: ("Move Hue Stop", "CLUSTER_COMMAND", (), 0x0300, 0x0047, ()),
-        0x41: (
+        0x40: GreenPowerCommand(
+            "Move Hue Stop", "CLUSTER_COMMAND", (), 0x0300, 0x0047, ()
+        ),
+        0x41: GreenPowerCommand(
             "Move Hue Up Color",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1426,7 +1486,7 @@ class GreenPowerProxy(Cluster):
             0x0001,
             (1,),
         ),
-        0x42: (
+        0x42: GreenPowerCommand(
             "Move Hue Down Color",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1434,7 +1494,7 @@ class GreenPowerProxy(Cluster):
             0x0001,
             (0,),
         ),
-        0x43: (
+        0x43: GreenPowerCommand(
             "Step Hue Up Color",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1442,7 +1502,7 @@ class GreenPowerProxy(Cluster):
             0x0002,
             (1,),
         ),
-        0x44: (
+        0x44: GreenPowerCommand(
             "Step Hue Down Color",
             "CLUSTER_COMMAND",
             (t.uint8_t, t.Optional(t.uint16_t)),
@@ -1450,7 +1510,7 @@ class GreenPowerProxy(Cluster):
             0x0002,
             (0,),
         ),
-        0x46: (
+        0x46: GreenPowerCommand(
             "Move Saturation Up",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1458,7 +1518,7 @@ class GreenPowerProxy(Cluster):
             0x0004,
             (1,),
         ),
-        0x47: (
+        0x47: GreenPowerCommand(
             "Move Saturation Down",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1466,7 +1526,7 @@ class GreenPowerProxy(Cluster):
             0x0004,
             (0,),
         ),
-        0x48: (
+        0x48: GreenPowerCommand(
             "Step Saturation Up",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1474,7 +1534,7 @@ class GreenPowerProxy(Cluster):
             0x0005,
             (1,),
         ),
-        0x49: (
+        0x49: GreenPowerCommand(
             "Step Saturation Down",
             "CLUSTER_COMMAND",
             (t.uint8_t,),
@@ -1482,7 +1542,7 @@ class GreenPowerProxy(Cluster):
             0x0005,
             (0,),
         ),
-        0x4A: (
+        0x4A: GreenPowerCommand(
             "Move Color",
             "CLUSTER_COMMAND",
             (t.uint16_t, t.uint16_t),
@@ -1490,7 +1550,7 @@ class GreenPowerProxy(Cluster):
             0x0008,
             (),
         ),
-        0x4B: (
+        0x4B: GreenPowerCommand(
             "Step Color",
             "CLUSTER_COMMAND",
             (t.uint16_t, t.uint16_t, t.Optional(t.uint16_t)),
@@ -1498,20 +1558,40 @@ class GreenPowerProxy(Cluster):
             0x0009,
             (),
         ),
-        0x45: ("Move Saturation Stop", "CLUSTER_COMMAND", (), 0x0300, 0x0047, ()),
-        0x50: ("Lock Door", "CLUSTER_COMMAND", (), 0x0101, 0x0000, ()),
-        0x51: ("Unlock Door", "CLUSTER_COMMAND", (), 0x0101, 0x0001, ()),
-        0x60: ("Press 1 of 1", "CLUSTER_COMMAND", (), None, None, ()),
-        0x61: ("Release 1 of 1", "CLUSTER_COMMAND", (), None, None, ()),
-        0x62: ("Press 1 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x63: ("Release 1 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x64: ("Press 2 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x65: ("Release 2 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x66: ("Short press 1 of 1", "CLUSTER_COMMAND", (), None, None, ()),
-        0x67: ("Short press 1 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x68: ("Short press 2 of 2", "CLUSTER_COMMAND", (), None, None, ()),
-        0x69: ("Press", "CLUSTER_COMMAND", (t.uint8_t,), 0x0005, 0x0001, (0,)),
-        0x6A: ("Release", "CLUSTER_COMMAND", (t.uint8_t,), None, None, ()),
+        0x45: GreenPowerCommand(
+            "Move Saturation Stop", "CLUSTER_COMMAND", (), 0x0300, 0x0047, ()
+        ),
+        0x50: GreenPowerCommand("Lock Door", "CLUSTER_COMMAND", (), 0x0101, 0x0000, ()),
+        0x51: GreenPowerCommand(
+            "Unlock Door", "CLUSTER_COMMAND", (), 0x0101, 0x0001, ()
+        ),
+        0x60: GreenPowerCommand("Press 1 of 1", "CLUSTER_COMMAND", (), None, None, ()),
+        0x61: GreenPowerCommand(
+            "Release 1 of 1", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x62: GreenPowerCommand("Press 1 of 2", "CLUSTER_COMMAND", (), None, None, ()),
+        0x63: GreenPowerCommand(
+            "Release 1 of 2", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x64: GreenPowerCommand("Press 2 of 2", "CLUSTER_COMMAND", (), None, None, ()),
+        0x65: GreenPowerCommand(
+            "Release 2 of 2", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x66: GreenPowerCommand(
+            "Short press 1 of 1", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x67: GreenPowerCommand(
+            "Short press 1 of 2", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x68: GreenPowerCommand(
+            "Short press 2 of 2", "CLUSTER_COMMAND", (), None, None, ()
+        ),
+        0x69: GreenPowerCommand(
+            "Press", "CLUSTER_COMMAND", (t.uint8_t,), 0x0005, 0x0001, (0,)
+        ),
+        0x6A: GreenPowerCommand(
+            "Release", "CLUSTER_COMMAND", (t.uint8_t,), None, None, ()
+        ),
     }
     device = {
         0x00: ("Simple Generic 1-state Switch", [], [0x0006]),
@@ -1531,32 +1611,18 @@ class GreenPowerProxy(Cluster):
         0x32: ("Flow Sensor", [0x0404], []),
         0x33: ("Indoor Environment Sensor", [], []),
     }
-    device = {
-        0x00: ("Simple Generic 1-state Switch", [], [0x0006]),
-        0x01: ("Simple Generic 2-state Switch", [], [0x0006]),
-        0x02: ("On/Off Switch", [], [0x0005, 0x0006]),
-        0x03: ("Level Control Switch", [], [0x0008]),
-        0x04: ("Simple Sensor", [], []),
-        0x05: ("Advanced Generic 1-state Switch", [], [0x0005, 0x0006]),
-        0x06: ("Advanced Generic 2-state Switch", [], [0x0005, 0x0006]),
-        0x07: ("On/Off Switch", [], [0x0005, 0x0006]),
-        0x10: ("Color Dimmer Switch", [], [0x0300]),
-        0x11: ("Light Sensor", [0x0400], []),
-        0x12: ("Occupancy Sensor", [0x0406], []),
-        0x20: ("Door Lock Controller", [], [0x0101]),
-        0x30: ("Temperature Sensor", [0x0402], []),
-        0x31: ("Pressure Sensor", [0x0403], []),
-        0x32: ("Flow Sensor", [0x0404], []),
-        0x33: ("Indoor Environment Sensor", [], []),
-    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # pairing deadline on the monotonic clock, joiningAllowUntil keeps the
+        # Unix timestamp of the same deadline for attribute readers
+        self._permit_until = 0.0
 
     def create_device(self, ieee, type=None, remoteCommissioning=False):
         application = self.endpoint.device.application
         if ieee in application.devices:
             return application.devices[ieee]
-        if not remoteCommissioning and (
-            0x9997 not in self._attr_cache or self._attr_cache[0x9997] < time.time()
-        ):
+        if not remoteCommissioning and self._permit_until < time.monotonic():
             LOGGER.debug("Not in permit joining mode and not in remoteCommissioning")
             return
         LOGGER.debug("Device %s not found, create it", ieee)
@@ -1596,37 +1662,40 @@ class GreenPowerProxy(Cluster):
         application.device_initialized(dev)
         return dev
 
-    def handle_notification(
-        self, ieee, header, counter, command_id, payload, payload_length, mic
-    ):
+    def handle_notification(self, ieee, header, counter, command_id, payload, mic):
         application = self.endpoint.device.application
-        if ieee not in application.devices:
+        dev = application.devices.get(ieee)
+        if dev is None:
             return
         if command_id not in GreenPowerProxy.command:
             LOGGER.debug("Unhandled command_id : %s", command_id)
             return
-        calcul_mic = self.calcul_mic(
-            ieee,
-            header,
-            counter,
-            command_id.to_bytes(1, "little")
-            + payload.to_bytes(payload_length, "little"),
-            payload_length + 1,
-        )
-        if calcul_mic is not None and calcul_mic != mic:
-            LOGGER.debug(
-                "Wrong mic : %s, calcul mic %s, ignore frame", hex(mic), hex(calcul_mic)
+        gp_cluster = dev.endpoints[self.endpoint_id].in_clusters[self.cluster_id]
+        attr_cache = gp_cluster._attr_cache
+        key = attr_cache.get(0x9998)
+        if key is not None:
+            calcul_mic = self._calcul_mic(
+                key, ieee, header, counter, command_id.to_bytes(1, "little") + payload
             )
+            if not hmac.compare_digest(calcul_mic, mic):
+                LOGGER.debug(
+                    "Wrong mic : 0x%s, calcul mic 0x%s, ignore frame",
+                    mic.hex(),
+                    calcul_mic.hex(),
+                )
+                return
+        counter = int.from_bytes(counter, "little")
+        last_counter = attr_cache.get(0x9999)
+        if last_counter is not None and last_counter >= counter:
+            LOGGER.debug("Already get this frame counter,I ignoring it")
             return
-        (
-            command,
-            type,
-            schema,
-            cluster_id,
-            zcl_command_id,
-            value,
-        ) = GreenPowerProxy.command[command_id]
-        payload, _ = t.deserialize(payload.to_bytes(payload_length, "little"), schema)
+        command = GreenPowerProxy.command[command_id]
+        try:
+            payload, _ = t.deserialize(payload, command.schema)
+        except ValueError:
+            LOGGER.debug("Malformed payload for command_id %s, ignoring it", command_id)
+            return
+        gp_cluster._update_attribute(0x9999, counter)
         LOGGER.debug(
             "Green power frame ieee : %s, command_id : %s, payload : %s,counter : %s",
             ieee,
@@ -1634,23 +1703,15 @@ class GreenPowerProxy(Cluster):
             payload,
             counter,
         )
-        value = value + tuple(payload)
-        dev = application.devices[ieee]
-        if counter is not None:
-            attributes = (
-                dev.endpoints[self.endpoint_id].in_clusters[self.cluster_id]._attr_cache
-            )
-            if 0x9999 in attributes and attributes[0x9999] >= counter:
-                LOGGER.debug("Already get this frame counter,I ignoring it")
-                return
-            attributes._update_attribute(0x9999, counter)
-        if cluster_id is not None and type == "CLUSTER_COMMAND":
+        value = command.value + tuple(payload)
+        cluster_id = command.cluster_id
+        if cluster_id is not None and command.type == "CLUSTER_COMMAND":
             if cluster_id not in dev.endpoints[1].out_clusters:
                 dev.endpoints[1].add_output_cluster(cluster_id)
                 application.device_initialized(dev)
             dev.endpoints[1].out_clusters[cluster_id].handle_message(
                 foundation.ZCLHeader.cluster(
-                    application.get_sequence(), zcl_command_id
+                    application.get_sequence(), command.zcl_command_id
                 ),
                 value,
             )
@@ -1662,89 +1723,82 @@ class GreenPowerProxy(Cluster):
             type = data[6]
             self.create_device(ieee, type)
             return
-        payload = ()
-        ieee = t.EUI64(data[2:6] + data[2:6])
-        counter = int.from_bytes(data[6:10], byteorder="little")
-        command_id = data[10]
-        payload_length = len(data[11:-4])
-        payload = int.from_bytes(data[11:-4], byteorder="little")
-        mic = int.from_bytes(data[-4:], byteorder="little")
-        header = int.from_bytes(data[0:2], byteorder="little")
+        # header, counter, payload and mic are kept as the raw little endian bytes
+        header, src_id, counter, command_id = _GP_NOTIFICATION.unpack_from(data)
+        ieee = t.EUI64(src_id + src_id)
         self.handle_notification(
-            ieee, header, counter, command_id, payload, payload_length, mic
+            ieee, header, counter, command_id, data[11:-4], data[-4:]
         )
 
-    def calcul_mic(self, ieee, header, counter, payload, payload_length):
+    def calcul_mic(self, ieee, header, counter, payload):
+        """Compute the MIC of a frame, all arguments but `ieee` are raw bytes."""
         application = self.endpoint.device.application
-        if ieee not in application.devices:
+        dev = application.devices.get(ieee)
+        if dev is None:
             return None
-        dev = application.devices[ieee]
-        if (
-            0x9998
-            not in dev.endpoints[self.endpoint_id]
-            .in_clusters[self.cluster_id]
-            ._attr_cache
-        ):
-            return None
-        src_id = bytearray(ieee[0:4])
-        if not isinstance(header, (bytes)):
-            header = header.to_bytes(2, "little")
-        if not isinstance(counter, (bytes)):
-            counter = counter.to_bytes(4, "little")
-        if not isinstance(payload, (bytes)):
-            payload = payload.to_bytes(payload_length, "little")
-        LOGGER.debug(
-            "Calcul mic of green power frame for %s on header : 0x%s, src_id : 0x%s, counter : 0x%s, payload : 0x%s, payload length : %s",
-            ieee,
-            header.hex(),
-            src_id.hex(),
-            counter.hex(),
-            payload.hex(),
-            payload_length,
-        )
         key = (
             dev.endpoints[self.endpoint_id]
             .in_clusters[self.cluster_id]
-            ._attr_cache[0x9998]
+            ._attr_cache.get(0x9998)
         )
-        nonce = src_id + src_id + counter + (0x05).to_bytes(1, "little")
-        header = header + src_id + counter
-        a = header + payload
-        La = len(a).to_bytes(2, "big")
-        AddAuthData = La + a
-        AddAuthData += (0x00).to_bytes(1, "little") * (16 - len(AddAuthData))
-        B0 = (0x49).to_bytes(1, "little") + nonce
-        B0 += (0x00).to_bytes(1, "little") * (16 - len(B0))
-        B1 = AddAuthData
-        X0 = (0x00000000000000000000000000000000).to_bytes(16, "big")
-        cipher = AES.new(key, AES.MODE_CBC, B0)
-        X1 = cipher.encrypt(X0)
-        cipher = AES.new(key, AES.MODE_CBC, B1)
-        X2 = cipher.encrypt(X1)
-        A0 = (0x01).to_bytes(1, "little") + nonce + (0x0000).to_bytes(2, "big")
-        cipher = AES.new(
-            key,
-            AES.MODE_CTR,
-            counter=Counter.new(128, initial_value=int.from_bytes(A0, byteorder="big")),
+        if key is None:
+            return None
+        return self._calcul_mic(key, ieee, header, counter, payload)
+
+    def _calcul_mic(self, key, ieee, header, counter, payload):
+        # the GPD source id is the low half of the EUI64 built in handle_message
+        src_id = bytes(ieee[0:4])
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Calcul mic of green power frame for %s on header : 0x%s, src_id : 0x%s, counter : 0x%s, payload : 0x%s, payload length : %s",
+                ieee,
+                header.hex(),
+                src_id.hex(),
+                counter.hex(),
+                payload.hex(),
+                len(payload),
+            )
+        # src_id + counter is shared by the nonce and the authenticated data, the
+        # security control byte of the nonce is fixed for frames sent by a GPD
+        src_counter = src_id + counter
+        nonce = b"".join((src_id, src_counter, b"\x05"))
+        return zigpy.util.aes_ccm_encrypt(
+            key, nonce, b"", b"".join((header, src_counter, payload)), 4
         )
-        return int.from_bytes(cipher.encrypt(X2[0:4]), byteorder="little")
 
-    def setKey(self, key):
-        if key is None:
-            del self._attr_cache[0x9998]
-            return
-        if not isinstance(key, (bytes)):
+    def set_key(self, key):
+        """Set the GPD key, given as 16 bytes or as a big endian integer."""
+        if isinstance(key, int):
             key = key.to_bytes(16, "big")
+        key = bytes(key)
+        if len(key) != 16:
+            raise ValueError(f"Green power key must be 16 bytes, got {len(key)}")
+        zigpy.util.clear_key_cache()
         self._update_attribute(0x9998, key)
 
+    def clear_key(self):
+        """Forget the GPD key, frames are then accepted without a MIC check."""
+        zigpy.util.clear_key_cache()
+        self._attr_cache.pop(0x9998, None)
+
+    def setKey(self, key):
+        """Set the GPD key, or clear it when `key` is None."""
+        if key is None:
+            self.clear_key()
+        else:
+            self.set_key(key)
+
     async def permit(self, time_s=60):
-        assert 0 <= time_s <= 254
+        if not 0 <= time_s <= 254:
+            raise ValueError(f"Permit duration must be 0-254 s, got {time_s}")
+        time_s = int(round(time_s))
         LOGGER.debug("Permit green power pairing for %s s", time_s)
+        self._permit_until = time.monotonic() + time_s
         self._attr_cache[0x9997] = int(time.time() + time_s)
         tsn = self.endpoint.device.application.get_sequence()
-        hdr = foundation.ZCLHeader.cluster(tsn, 2)  # commissioning
-        hdr.frame_control.disable_default_response = True
-        data = hdr.serialize() + t.serialize((0x0B, time_s), (t.uint8_t, t.uint16_t))
+        data = bytearray(_GP_PERMIT_TEMPLATE)
+        data[_GP_PERMIT_TSN_OFFSET] = tsn
+        _GP_PERMIT_TIME.pack_into(data, len(data) - _GP_PERMIT_TIME.size, time_s)
         return await self.endpoint.device.application.broadcast(
             profile=zigpy.profiles.zha.PROFILE_ID,
             cluster=self.cluster_id,
@@ -1753,5 +1807,5 @@ class GreenPowerProxy(Cluster):
             grpid=None,
             radius=30,
             sequence=tsn,
-            data=data,
+            data=bytes(data),
         )
@@ -129,6 +129,12 @@ class DataTypes(dict):
         self._idx_by_class = {
             _type: type_id for type_id, (name, _type, ad) in self.items()
         }
+        self._idx_by_alias = {}
+
+    def add_alias(self, python_type, type_id: int) -> None:
+        """Map another python type to the Zigbee Datatype ID of an existing type."""
+        assert type_id in self
+        self._idx_by_alias[python_type] = type_id
 
     def pytype_to_datatype_id(self, python_type) -> int:
         """Return Zigbee Datatype ID for a give python type."""
@@ -137,6 +143,8 @@ class DataTypes(dict):
         for cls in python_type.__mro__:
             if cls in self._idx_by_class:
                 return self._idx_by_class[cls]
+            if cls in self._idx_by_alias:
+                return self._idx_by_alias[cls]
 
         return 0xFF
 
@@ -206,6 +214,9 @@ DATA_TYPES = DataTypes(
     }
 )
 
+# bytes backed 128-bit keys, e.g. of the Commissioning cluster, share the key type
+DATA_TYPES.add_alias(t.FixedBytes[16], 0xF1)
+
 
 class ReadAttributeRecord(t.Struct):
     """Read Attribute Record."""
@@ -658,12 +669,14 @@ class ZCLHeader:
     def deserialize(cls, data):
         """Deserialize from bytes."""
         frc, data = FrameControl.deserialize(data)
-        r = cls(frc)
+        manufacturer = None
         if frc.is_manufacturer_specific:
-            r.manufacturer, data = t.uint16_t.deserialize(data)
-        r.tsn, data = t.uint8_t.deserialize(data)
-        r.command_id, data = Command.deserialize(data)
-        return r, data
+            manufacturer, data = t.uint16_t.deserialize(data)
+        if len(data) < 2:
+            raise ValueError("Data is too short to contain a ZCL header")
+
+        # tsn and command id are single bytes, build the header in a single step
+        return cls(frc, data[0], data[1], manufacturer), data[2:]
 
     def serialize(self):
         """Serialize to bytes."""